@@ -54,6 +54,26 @@ class UserDataControl:
             self.set_hide_changelog(False)
             return False
 
+    def set_rate_limit(self, rate_limit):
+        self._sh['rate_limit'] = rate_limit
+
+    def get_rate_limit(self):
+        try:
+            return self._sh.get('rate_limit', 0)
+        except:
+            self.set_rate_limit(0)
+            return 0
+
+    def set_mirrors(self, mirrors):
+        self._sh['mirrors'] = list(mirrors)
+
+    def get_mirrors(self):
+        try:
+            return self._sh.get('mirrors', [])
+        except:
+            self.set_mirrors([])
+            return []
+
     def load_user_data(self):
         try:
             return self._sh.get('path', ''), self._sh.get('version', '')
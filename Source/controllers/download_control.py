@@ -0,0 +1,137 @@
+"""Handle control over rate limited downloads from mirrors"""
+
+import http.client
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from functools import partial
+
+CHUNK_SIZE = 16 * 1024
+PROBE_SIZE = 32 * 1024
+PROBE_TIMEOUT = 5
+DOWNLOAD_TIMEOUT = 30
+
+# errors from a source that is down, misconfigured or drops the connection mid-transfer
+NETWORK_ERRORS = (OSError, ValueError, http.client.HTTPException)
+
+
+class TokenBucket:
+    """Limit throughput to `rate` bytes per second with bursts of up to `capacity` bytes"""
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, CHUNK_SIZE))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def consume(self, amount):
+        """Block until `amount` bytes may be sent"""
+        while amount > 0:
+            step = min(amount, self.capacity)
+            with self._lock:
+                self._refill()
+                wait = (step - self._tokens) / self.rate
+                self._tokens -= step
+            if wait > 0:
+                self._sleep(wait)
+            amount -= step
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+
+def mirror_links(link, mirrors=()):
+    """List the download candidates for `link`: each mirror base url followed by the original link"""
+    file_name = os.path.basename(link)
+    links = [mirror.rstrip('/') + '/' + file_name for mirror in mirrors if mirror]
+    links.append(link)
+    return list(dict.fromkeys(links))
+
+
+def probe_link(link, bucket=None, probe_size=PROBE_SIZE, timeout=PROBE_TIMEOUT):
+    """Return the measured throughput of `link` in bytes per second, or None if it is unreachable.
+
+    Only the first `probe_size` bytes are requested. When a `bucket` is given the probe is paced by it,
+    so a source faster than the rate limit measures at about the limit.
+    """
+    request = urllib.request.Request(link, headers={'Range': 'bytes=0-%d' % (probe_size - 1)})
+    try:
+        start = time.monotonic()
+        received = 0
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            while received < probe_size:
+                block = response.read(min(CHUNK_SIZE, probe_size - received))
+                if not block:
+                    break
+                if bucket is not None:
+                    bucket.consume(len(block))
+                received += len(block)
+        elapsed = time.monotonic() - start
+    except NETWORK_ERRORS:
+        return None
+
+    if not received:
+        return None
+    return received / max(elapsed, 1e-6)
+
+
+def rank_links(links, probe=probe_link):
+    """Order links fastest first; unreachable links are kept last so they can still be tried.
+
+    Links are probed one at a time so the probes do not compete with each other for bandwidth.
+    Ties keep the given order, so mirrors are preferred over the original link.
+    """
+    if len(links) < 2:
+        return list(links)
+
+    speeds = [probe(link) for link in links]
+    reachable = sorted((i for i, speed in enumerate(speeds) if speed is not None), key=lambda i: -speeds[i])
+    unreachable = [i for i, speed in enumerate(speeds) if speed is None]
+    return [links[i] for i in reachable + unreachable]
+
+
+def download(link, file_name, mirrors=(), rate_limit=0, probe=None):
+    """Download `link` to `file_name` from the fastest mirror, failing over to the others.
+
+    `rate_limit` is in bytes per second, 0 means unlimited; it covers the probes as well as the download.
+    Returns the url that was used.
+    """
+    bucket = TokenBucket(rate_limit) if rate_limit else None
+    if probe is None:
+        probe = partial(probe_link, bucket=bucket)
+    error = None
+    for url in rank_links(mirror_links(link, mirrors), probe):
+        try:
+            _fetch(url, file_name, bucket)
+            return url
+        except NETWORK_ERRORS as err:
+            error = err
+            if os.path.isfile(file_name):
+                os.remove(file_name)
+
+    raise error
+
+
+def _fetch(url, file_name, bucket=None):
+    with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response, open(file_name, 'wb') as out:
+        size = int(response.headers.get('Content-Length', -1))
+        read = 0
+        while True:
+            block = response.read(CHUNK_SIZE)
+            if not block:
+                break
+            if bucket is not None:
+                bucket.consume(len(block))
+            read += len(block)
+            out.write(block)
+
+    if 0 <= size and read < size:
+        raise urllib.error.ContentTooShortError(
+            'retrieval incomplete: got only %i out of %i bytes' % (read, size), None)
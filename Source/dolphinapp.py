@@ -2,8 +2,6 @@ import os
 import subprocess
 import sys
 import traceback
-import urllib
-import urllib.request
 from contextlib import suppress
 
 from PyQt5.QtCore import QThread, pyqtSignal
@@ -17,6 +15,7 @@ from PyQt5.QtWidgets import QMainWindow, QApplication, QAction, qApp, QMessageBo
 
 from controllers.data_control import extract_7z, UserDataControl, rename_7z
 from controllers.dolphin_control import get_dolphin_link, get_dolphin_html, get_dolphin_changelog
+from controllers.download_control import download
 
 
 class DolphinUpdate(QMainWindow):
@@ -222,7 +221,7 @@ class DolphinUpdate(QMainWindow):
                 self.show_warning('Please select a dolphin folder.')
 
             self.version.setText('')
-            self.download_thread.update(dolphin_dir, version)
+            self.download_thread.update(dolphin_dir, version, self._udc.get_mirrors(), self._udc.get_rate_limit())
             self.download_thread.start()
 
     def update_changelog(self, message):
@@ -329,17 +328,21 @@ class DownloadThread(QThread):
     status = pyqtSignal(str)
     error = pyqtSignal(str)
 
-    def __init__(self, dir='', version=''):
+    def __init__(self, dir='', version='', mirrors=(), rate_limit=0):
         QThread.__init__(self)
         self.version = version
         self.dir = dir
+        self.mirrors = mirrors
+        self.rate_limit = rate_limit
 
     def __del__(self):
         self.wait()
 
-    def update(self, dir, version):
+    def update(self, dir, version, mirrors=(), rate_limit=0):
         self.version = version
         self.dir = dir
+        self.mirrors = mirrors
+        self.rate_limit = rate_limit
 
     def run(self):
         """run thread task"""
@@ -356,7 +359,7 @@ class DownloadThread(QThread):
 
         try:
             self.status.emit('Downloading...')
-            urllib.request.urlretrieve(link, zip_file)
+            download(link, zip_file, self.mirrors, self.rate_limit * 1024)
             self.status.emit('Downloaded. Extracting...')
 
             if not os.path.isfile('res/7za.exe'):
@@ -3,12 +3,11 @@
 import argparse
 import os
 import sys
-import urllib
-import urllib.request
 from contextlib import suppress
 
 from controllers.data_control import extract_7z, UserDataControl, rename_7z
 from controllers.dolphin_control import get_dolphin_link
+from controllers.download_control import download
 
 
 class DolphinCmd:
@@ -34,6 +33,11 @@ class DolphinCmd:
         parser.add_argument('-f', '--set-folder', dest='folder', help='set your dolphin directory')
         parser.add_argument('-d', '--download', dest='download', action='store_true',
                             help='download the latest version and extract to your directory')
+        parser.add_argument('-l', '--limit-rate', dest='rate_limit', type=int, metavar='KBPS',
+                            help='set the download rate limit in KB/s for this machine (0 for unlimited)')
+        parser.add_argument('-m', '--mirrors', dest='mirrors', nargs='*', metavar='URL',
+                            help='set the mirror base urls to download from, fastest is used (none to clear). '
+                                 'Each mirror must serve builds flat by file name, eg URL/dolphin-master-5.0-x64.7z')
         options = parser.parse_args(self.args)
 
         # Return the argument values
@@ -46,12 +50,19 @@ class DolphinCmd:
             version = self.version
             print('Dolphin Directory: ' + (path if path else 'Unknown'))
             print('Dolphin Version: ' + (version if version else 'Unknown'))
+            rate_limit = self._udc.get_rate_limit()
+            print('Download Rate Limit: ' + ('%d KB/s' % rate_limit if rate_limit else 'Unlimited'))
+            print('Download Mirrors: ' + (', '.join(self._udc.get_mirrors()) or 'None'))
         if opt.retrieve:
             self._retrieve_current()
         if opt.clear:
             self._clear_version()
         if opt.folder:
             self._set_dolphin_folder(opt.folder)
+        if opt.rate_limit is not None:
+            self._set_rate_limit(opt.rate_limit)
+        if opt.mirrors is not None:
+            self._set_mirrors(opt.mirrors)
         if opt.download:
             self._download_new()
 
@@ -77,8 +88,8 @@ class DolphinCmd:
 
         try:
             print('Downloading...')
-            urllib.request.urlretrieve(link, zip_file)
-            print('Downloaded. Extracting...')
+            url = download(link, zip_file, self._udc.get_mirrors(), self._udc.get_rate_limit() * 1024)
+            print('Downloaded from %s. Extracting...' % url)
 
             if not os.path.isfile('res/7za.exe'):
                 print('Update failed: Please install 7-Zip')
@@ -107,6 +118,17 @@ class DolphinCmd:
         else:
             print('Directory not found.')
 
+    def _set_rate_limit(self, rate_limit):
+        if rate_limit >= 0:
+            self._udc.set_rate_limit(rate_limit)
+            print('Download Rate Limit: ' + ('%d KB/s' % rate_limit if rate_limit else 'Unlimited'))
+        else:
+            print('Rate limit must not be negative.')
+
+    def _set_mirrors(self, mirrors):
+        self._udc.set_mirrors(mirrors)
+        print('Download Mirrors: ' + (', '.join(mirrors) or 'None'))
+
     def _retrieve_current(self):
         """retrieve the current version"""
         try:
@@ -0,0 +1,165 @@
+"""Tests for rate limited downloads from mirrors, served by throttled local http servers"""
+
+import http.server
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from controllers.download_control import TokenBucket, download, mirror_links, rank_links
+
+DATA = os.urandom(256 * 1024)
+SERVE_CHUNK = 4 * 1024
+
+
+def start_server(delay=0.0, status=200, truncate=False):
+    """Serve DATA at any path, sleeping `delay` seconds per chunk. Returns (server, base url)"""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if status != 200:
+                self.send_error(status)
+                return
+
+            self.send_response(200)
+            self.send_header('Connection', 'close')
+            if truncate:
+                # send one chunk of a chunked body, then drop the connection
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                self.wfile.write(b'%x\r\n%s\r\n' % (SERVE_CHUNK, DATA[:SERVE_CHUNK]))
+                return
+
+            self.send_header('Content-Length', str(len(DATA)))
+            self.end_headers()
+            try:
+                for i in range(0, len(DATA), SERVE_CHUNK):
+                    self.wfile.write(DATA[i:i + SERVE_CHUNK])
+                    time.sleep(delay)
+            except OSError:
+                pass  # the client closed early, eg after a probe
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, 'http://127.0.0.1:%d/builds' % server.server_address[1]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.slept += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(100, capacity=100, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_burst_is_free(self):
+        self.bucket.consume(100)
+        self.assertEqual(self.clock.slept, 0)
+
+    def test_waits_for_tokens(self):
+        self.bucket.consume(100)
+        self.bucket.consume(50)
+        self.assertAlmostEqual(self.clock.slept, 0.5)
+
+    def test_refills_over_time(self):
+        self.bucket.consume(100)
+        self.clock.now += 1
+        self.bucket.consume(100)
+        self.assertEqual(self.clock.slept, 0)
+
+    def test_consume_more_than_capacity(self):
+        self.bucket.consume(350)
+        self.assertAlmostEqual(self.clock.slept, 2.5)
+
+
+class TestMirrors(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.servers = {}
+        for name, options in (('fast', {}), ('mid', {'delay': 0.01}), ('slow', {'delay': 0.05}),
+                              ('error', {'status': 500}), ('truncated', {'truncate': True})):
+            cls.servers[name] = start_server(**options)
+
+    @classmethod
+    def tearDownClass(cls):
+        for server, url in cls.servers.values():
+            server.shutdown()
+            server.server_close()
+
+    def setUp(self):
+        handle, self.file_name = tempfile.mkstemp()
+        os.close(handle)
+
+    def tearDown(self):
+        if os.path.isfile(self.file_name):
+            os.remove(self.file_name)
+
+    def link(self, name):
+        return self.servers[name][1] + '/dolphin.7z'
+
+    def test_mirror_links(self):
+        links = mirror_links('https://dl.example/builds/dolphin.7z', ['http://cache.lan/', 'http://cache.lan'])
+        self.assertEqual(links, ['http://cache.lan/dolphin.7z', 'https://dl.example/builds/dolphin.7z'])
+
+    def test_rank_links_fastest_first(self):
+        links = [self.link('slow'), self.link('error'), self.link('fast'), self.link('mid')]
+        self.assertEqual(rank_links(links), [self.link('fast'), self.link('mid'), self.link('slow'),
+                                             self.link('error')])
+
+    def test_rank_links_truncated_is_unreachable(self):
+        links = [self.link('truncated'), self.link('fast')]
+        self.assertEqual(rank_links(links), [self.link('fast'), self.link('truncated')])
+
+    def _download_via(self, broken):
+        # rank the broken mirror first so the download has to fail over
+        probe = lambda link: 2.0 if link == self.link(broken) else 1.0
+        url = download(self.link('fast'), self.file_name, [self.servers[broken][1]], probe=probe)
+        self.assertEqual(url, self.link('fast'))
+        with open(self.file_name, 'rb') as f:
+            self.assertEqual(f.read(), DATA)
+
+    def test_failover_past_error(self):
+        self._download_via('error')
+
+    def test_failover_past_truncated(self):
+        self._download_via('truncated')
+
+    def test_all_sources_fail(self):
+        with self.assertRaises(Exception):
+            download(self.link('error'), self.file_name, [self.servers['truncated'][1]])
+        self.assertFalse(os.path.isfile(self.file_name))
+
+    def test_rate_limit(self):
+        rate = 128 * 1024
+        start = time.monotonic()
+        download(self.link('fast'), self.file_name, rate_limit=rate)
+        elapsed = time.monotonic() - start
+
+        # the bucket starts full, so the first `rate` bytes are a free burst
+        expected = (len(DATA) - rate) / rate
+        self.assertGreater(elapsed, expected * 0.9)
+        self.assertLess(elapsed, expected + 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()